@@ -1,13 +1,34 @@
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import List, Tuple
+from typing import List, Optional, Tuple
+import math
+import os
 import numpy as np
 import cv2
 
+try:
+    from numba import njit, prange
+    _HAS_NUMBA = True
+except ImportError:  # optional: fall back to the NumPy implementation
+    _HAS_NUMBA = False
+
 # ----- Low-level color helpers -----
 def hex_to_rgb(hex_str: str) -> Tuple[int, int, int]:
     h = hex_str.lstrip("#")
     return tuple(int(h[i:i+2], 16) for i in (0, 2, 4))
 
+def hex_array_to_rgb(hex_list: List[str]) -> np.ndarray:
+    """
+    Parse many "#rrggbb" strings at once -> uint8 array (N,3).
+    Raises ValueError if any entry is not exactly 6 hex digits.
+    """
+    digits = [h.lstrip("#") for h in hex_list]
+    bad = [h for h, d in zip(hex_list, digits) if len(d) != 6]
+    if bad:
+        raise ValueError(f"Expected #rrggbb hex colors, got {bad!r}")
+    buf = bytes.fromhex("".join(digits))
+    return np.frombuffer(buf, dtype=np.uint8).reshape(-1, 3)
+
 def rgb_to_hex(rgb: Tuple[int, int, int]) -> str:
     return "#{:02x}{:02x}{:02x}".format(*rgb)
 
@@ -15,10 +36,9 @@ def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
     """
     Convert uint8 RGB array shape (N,3) -> LAB float32 (N,3) using OpenCV.
     """
-    bgr = rgb[:, ::-1].astype(np.uint8)           # OpenCV expects BGR
-    bgr = bgr[np.newaxis, :, :]                   # (1,N,3)
-    lab = cv2.cvtColor(bgr, cv2.COLOR_BGR2LAB)[0] # (N,3)
-    return lab.astype(np.float32)
+    arr = np.ascontiguousarray(rgb, dtype=np.uint8).reshape(1, -1, 3)  # (1,N,3)
+    lab = cv2.cvtColor(arr, cv2.COLOR_RGB2LAB)                          # (1,N,3)
+    return lab.reshape(-1, 3).astype(np.float32, copy=False)
 
 # ----- ΔE 1976 -----
 def deltaE76(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
@@ -32,24 +52,138 @@ def deltaE76(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
     return d
 
 # ----- ΔE 2000 (CIEDE2000) -----
-def deltaE2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
+# Below this many (N*M) pairs, thread start-up outweighs prange's gain
+# (palette matching is K<=12 x ~250), so the serial kernel is used.
+_NUMBA_PARALLEL_MIN_PAIRS = 100_000
+
+if _HAS_NUMBA:
+    _TWO_PI = 2.0 * math.pi
+    _P25_7 = 25.0**7
+    _DEG6 = math.radians(6.0)
+    _DEG30 = math.radians(30.0)
+    _DEG63 = math.radians(63.0)
+
+    @njit(fastmath=True, cache=True, nogil=True)
+    def _deltaE2000_pair(L1, a1, b1, C1, L2, a2, b2, C2):
+        """
+        CIEDE2000 for one pair of colors (same formula as deltaE2000),
+        computed in registers instead of via (N,M) temporaries.
+        """
+        C_bar7 = ((C1 + C2) / 2.0)**7
+        G = 0.5 * (1.0 - math.sqrt(C_bar7 / (C_bar7 + _P25_7)))
+
+        a1p = (1.0 + G) * a1
+        a2p = (1.0 + G) * a2
+        C1p = math.sqrt(a1p * a1p + b1 * b1)
+        C2p = math.sqrt(a2p * a2p + b2 * b2)
+
+        h1p = math.atan2(b1, a1p)
+        if h1p < 0.0:
+            h1p += _TWO_PI
+        h2p = math.atan2(b2, a2p)
+        if h2p < 0.0:
+            h2p += _TWO_PI
+
+        dLp = L1 - L2
+        dCp = C1p - C2p
+
+        dhp = h2p - h1p
+        if dhp > math.pi:
+            dhp -= _TWO_PI
+        elif dhp < -math.pi:
+            dhp += _TWO_PI
+        dHp = 2.0 * math.sqrt(C1p * C2p) * math.sin(dhp / 2.0)
+
+        Lp_bar = (L1 + L2) / 2.0
+        Cp_bar = (C1p + C2p) / 2.0
+
+        hp_bar = (h1p + h2p) / 2.0
+        if abs(h1p - h2p) > math.pi:
+            hp_bar += math.pi
+        if hp_bar >= _TWO_PI:
+            hp_bar -= _TWO_PI
+
+        T = (1.0
+             - 0.17 * math.cos(hp_bar - _DEG30)
+             + 0.24 * math.cos(2.0 * hp_bar)
+             + 0.32 * math.cos(3.0 * hp_bar + _DEG6)
+             - 0.20 * math.cos(4.0 * hp_bar - _DEG63))
+
+        Lm = (Lp_bar - 50.0)**2
+        SL = 1.0 + (0.015 * Lm) / math.sqrt(20.0 + Lm)
+        SC = 1.0 + 0.045 * Cp_bar
+        SH = 1.0 + 0.015 * Cp_bar * T
+
+        delta_theta = _DEG30 * math.exp(-((math.degrees(hp_bar) - 275.0) / 25.0)**2)
+        Cp_bar7 = Cp_bar**7
+        RC = 2.0 * math.sqrt(Cp_bar7 / (Cp_bar7 + _P25_7))
+        RT = -math.sin(2.0 * delta_theta) * RC
+
+        tL = dLp / SL
+        tC = dCp / SC
+        tH = dHp / SH
+        return math.sqrt(tL * tL + tC * tC + tH * tH + RT * tC * tH)
+
+    @njit(fastmath=True, cache=True, nogil=True)
+    def _deltaE2000_numba(L1s, a1s, b1s, L2s, a2s, b2s, C2, out):
+        for i in range(L1s.shape[0]):
+            C1 = math.sqrt(a1s[i] * a1s[i] + b1s[i] * b1s[i])
+            for j in range(L2s.shape[0]):
+                out[i, j] = _deltaE2000_pair(L1s[i], a1s[i], b1s[i], C1, L2s[j], a2s[j], b2s[j], C2[j])
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _deltaE2000_numba_parallel(L1s, a1s, b1s, L2s, a2s, b2s, C2, out):
+        for i in prange(L1s.shape[0]):
+            C1 = math.sqrt(a1s[i] * a1s[i] + b1s[i] * b1s[i])
+            for j in range(L2s.shape[0]):
+                out[i, j] = _deltaE2000_pair(L1s[i], a1s[i], b1s[i], C1, L2s[j], a2s[j], b2s[j], C2[j])
+
+# float32 constants so the NumPy path never promotes intermediates to float64
+_PI32 = np.float32(np.pi)
+_TWO_PI32 = np.float32(2 * np.pi)
+_DEG6_32 = np.float32(np.deg2rad(6))
+_DEG30_32 = np.float32(np.deg2rad(30))
+_DEG63_32 = np.float32(np.deg2rad(63))
+_P25_7_32 = np.float32(25.0**7)
+
+def deltaE2000_soa(
+    L1: np.ndarray, a1: np.ndarray, b1: np.ndarray,
+    L2: np.ndarray, a2: np.ndarray, b2: np.ndarray,
+    C2: Optional[np.ndarray] = None
+) -> np.ndarray:
     """
-    Vectorized CIEDE2000 implementation.
-    lab1: (N,3) float32/64  [L*, a*, b*]
-    lab2: (M,3) float32/64
+    CIEDE2000 on split (structure-of-arrays) channels, so every ufunc
+    streams a contiguous vector instead of every third float.
+    L1, a1, b1: (N,)   L2, a2, b2: (M,)
+    C2: optional precomputed chroma sqrt(a2^2 + b2^2), shape (M,)
     Returns: (N,M) distances
+    Computes in float32. Uses a fused Numba kernel when numba is installed
+    (prange-parallel only for large N*M).
     """
-    L1, a1, b1 = lab1[:, 0:1], lab1[:, 1:2], lab1[:, 2:3]   # (N,1)
-    L2, a2, b2 = lab2[None, :, 0], lab2[None, :, 1], lab2[None, :, 2]  # (1,M)
+    L1, a1, b1, L2, a2, b2 = (np.ascontiguousarray(x, dtype=np.float32) for x in (L1, a1, b1, L2, a2, b2))
+    if C2 is None:
+        C2 = np.sqrt(a2**2 + b2**2)
+    else:
+        C2 = np.ascontiguousarray(C2, dtype=np.float32)
+
+    if _HAS_NUMBA:
+        out = np.empty((L1.shape[0], L2.shape[0]), dtype=np.float32)
+        if out.size >= _NUMBA_PARALLEL_MIN_PAIRS:
+            _deltaE2000_numba_parallel(L1, a1, b1, L2, a2, b2, C2, out)
+        else:
+            _deltaE2000_numba(L1, a1, b1, L2, a2, b2, C2, out)
+        return out
+
+    L1, a1, b1 = L1[:, None], a1[:, None], b1[:, None]              # (N,1)
+    L2, a2, b2, C2 = L2[None, :], a2[None, :], b2[None, :], C2[None, :]  # (1,M)
 
     # Mean C*
     C1 = np.sqrt(a1**2 + b1**2)        # (N,1)
-    C2 = np.sqrt(a2**2 + b2**2)        # (1,M)
     C_bar = (C1 + C2) / 2.0
 
     # G factor
     C_bar7 = C_bar**7
-    G = 0.5 * (1 - np.sqrt(C_bar7 / (C_bar7 + (25.0**7))))
+    G = 0.5 * (1 - np.sqrt(C_bar7 / (C_bar7 + _P25_7_32)))
 
     # a' (prime)
     a1p = (1 + G) * a1
@@ -59,9 +193,7 @@ def deltaE2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
 
     # h' (prime) in radians
     def _atan2(y, x):
-        ang = np.arctan2(y, x)
-        ang = np.where(ang < 0, ang + 2*np.pi, ang)
-        return ang
+        return np.mod(np.arctan2(y, x), _TWO_PI32)
 
     h1p = _atan2(b1, a1p)  # (N,1)
     h2p = _atan2(b2, a2p)  # (1,M)
@@ -70,25 +202,22 @@ def deltaE2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
     dLp = L1 - L2
     dCp = C1p - C2p
 
-    dhp = h2p - h1p
-    dhp = np.where(dhp >  np.pi, dhp - 2*np.pi, dhp)
-    dhp = np.where(dhp < -np.pi, dhp + 2*np.pi, dhp)
+    dhp = (h2p - h1p + _PI32) % _TWO_PI32 - _PI32   # wrap into [-pi, pi)
     dHp = 2.0 * np.sqrt(C1p * C2p) * np.sin(dhp / 2.0)
 
     # L', C', h' means
     Lp_bar = (L1 + L2) / 2.0
     Cp_bar = (C1p + C2p) / 2.0
 
-    hp_bar = (h1p + h2p) / 2.0
-    hp_bar = np.where(np.abs(h1p - h2p) > np.pi, hp_bar + np.pi, hp_bar)
-    hp_bar = np.where(hp_bar >= 2*np.pi, hp_bar - 2*np.pi, hp_bar)
+    hp_sum = h1p + h2p
+    hp_bar = np.where(np.abs(h1p - h2p) > _PI32, (hp_sum + _TWO_PI32) / 2.0, hp_sum / 2.0) % _TWO_PI32
 
     # T term
     T = (1
-         - 0.17*np.cos(hp_bar - np.deg2rad(30))
+         - 0.17*np.cos(hp_bar - _DEG30_32)
          + 0.24*np.cos(2*hp_bar)
-         + 0.32*np.cos(3*hp_bar + np.deg2rad(6))
-         - 0.20*np.cos(4*hp_bar - np.deg2rad(63)))
+         + 0.32*np.cos(3*hp_bar + _DEG6_32)
+         - 0.20*np.cos(4*hp_bar - _DEG63_32))
 
     # SL, SC, SH
     SL = 1 + (0.015 * (Lp_bar - 50)**2) / np.sqrt(20 + (Lp_bar - 50)**2)
@@ -96,8 +225,9 @@ def deltaE2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
     SH = 1 + 0.015 * Cp_bar * T
 
     # Δθ, RC, RT
-    delta_theta = np.deg2rad(30) * np.exp(- ((np.rad2deg(hp_bar) - 275) / 25)**2)
-    RC = 2 * np.sqrt(Cp_bar**7 / (Cp_bar**7 + 25.0**7))
+    delta_theta = _DEG30_32 * np.exp(- ((np.rad2deg(hp_bar) - 275) / 25)**2)
+    Cp_bar7 = Cp_bar**7
+    RC = 2 * np.sqrt(Cp_bar7 / (Cp_bar7 + _P25_7_32))
     RT = -np.sin(2 * delta_theta) * RC
 
     # kL=kC=kH=1
@@ -111,7 +241,42 @@ def deltaE2000(lab1: np.ndarray, lab2: np.ndarray) -> np.ndarray:
         RT * (dCp / (kC * SC)) * (dHp / (kH * SH))
     )
 
-    return dE.astype(np.float32)
+    return dE.astype(np.float32, copy=False)
+
+def deltaE2000(lab1: np.ndarray, lab2: np.ndarray, C2: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Vectorized CIEDE2000 implementation.
+    lab1: (N,3) float32/64  [L*, a*, b*]
+    lab2: (M,3) float32/64
+    C2:   optional precomputed chroma sqrt(a2^2 + b2^2) of lab2, shape (M,)
+    Returns: (N,M) distances
+    Splits the channels and delegates to deltaE2000_soa.
+    """
+    lab1 = np.asarray(lab1)
+    lab2 = np.asarray(lab2)
+    return deltaE2000_soa(lab1[:, 0], lab1[:, 1], lab1[:, 2], lab2[:, 0], lab2[:, 1], lab2[:, 2], C2=C2)
+
+def deltaE2000_parallel(
+    lab1: np.ndarray,
+    lab2: np.ndarray,
+    C2: Optional[np.ndarray] = None,
+    n_jobs: Optional[int] = None
+) -> np.ndarray:
+    """
+    deltaE2000 for large N (e.g. matching every pixel).
+    With numba installed, deltaE2000 already splits rows across cores
+    (prange kernel), so it is called directly and n_jobs is ignored.
+    Otherwise lab1 is split into n_jobs row chunks (default os.cpu_count())
+    run on a thread pool; the NumPy ufuncs release the GIL while they work.
+    Returns: (N,M) distances
+    """
+    n_jobs = min(n_jobs or os.cpu_count() or 1, len(lab1))
+    if _HAS_NUMBA or n_jobs <= 1:
+        return deltaE2000(lab1, lab2, C2=C2)
+    chunks = np.array_split(lab1, n_jobs)
+    with ThreadPoolExecutor(max_workers=n_jobs) as pool:
+        parts = list(pool.map(lambda chunk: deltaE2000(chunk, lab2, C2=C2), chunks))
+    return np.concatenate(parts, axis=0)
 
 # ----- Matching to Tailwind -----
 @dataclass
@@ -141,17 +306,89 @@ def nearest_tailwind(
     entry = tw_entries[k]
     return TWMatch(name=entry.name, shade=entry.shade, hex=entry.hex, deltaE=float(dists[k]))
 
+def nearest_tailwind_batch(
+    rgbs: np.ndarray,
+    tw_entries: List,
+    tw_lab: np.ndarray,
+    method: str = "DE76",
+    tw_C: Optional[np.ndarray] = None,
+    tw_soa: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+) -> List[TWMatch]:
+    """
+    Return nearest Tailwind color for each row of a uint8 RGB array (K,3).
+    Same as calling nearest_tailwind per color, but with one ΔE call for all K.
+    tw_C: optional precomputed Tailwind chroma, forwarded to deltaE2000.
+    tw_soa: optional contiguous (L, a, b) split of tw_lab for deltaE2000_soa.
+    """
+    rgbs_lab = rgb_to_lab(np.asarray(rgbs, dtype=np.uint8).reshape(-1, 3))  # (K,3)
+    if method.upper() in ("DE2000", "CIEDE2000", "DE00"):
+        if tw_soa is None:
+            dists = deltaE2000(rgbs_lab, tw_lab, C2=tw_C)
+        else:
+            dists = deltaE2000_soa(rgbs_lab[:, 0], rgbs_lab[:, 1], rgbs_lab[:, 2], *tw_soa, C2=tw_C)
+    else:
+        dists = deltaE76(rgbs_lab, tw_lab)
+
+    ks = dists.argmin(axis=1)  # (K,)
+    matches = []
+    for row, k in enumerate(ks.tolist()):
+        entry = tw_entries[k]
+        matches.append(TWMatch(name=entry.name, shade=entry.shade, hex=entry.hex, deltaE=float(dists[row, k])))
+    return matches
+
+# ΔE76 candidates kept per color before ΔE2000. Only pays off for palettes
+# much larger than Tailwind's ~250 colors; the app uses the exact batch search.
+TAILWIND_PRUNE_T = 16
+
+def nearest_tailwind_pruned(
+    rgbs: np.ndarray,
+    tw_entries: List,
+    tw_lab: np.ndarray,
+    T: int = TAILWIND_PRUNE_T,
+    tw_C: Optional[np.ndarray] = None,
+    tw_soa: Optional[Tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+) -> List[TWMatch]:
+    """
+    ΔE2000 nearest Tailwind color for each row of a uint8 RGB array (K,3).
+    Ranks all Tailwind colors with cheap ΔE76 first, then evaluates ΔE2000
+    only on the T closest candidates per color.
+    tw_soa: optional contiguous (L, a, b) split of tw_lab for deltaE2000_soa.
+    """
+    rgbs_lab = rgb_to_lab(np.asarray(rgbs, dtype=np.uint8).reshape(-1, 3))  # (K,3)
+    d76 = deltaE76(rgbs_lab, tw_lab)                                         # (K,M)
+    if T < d76.shape[1]:
+        cand = np.argpartition(d76, T, axis=1)[:, :T]                        # (K,T)
+    else:
+        cand = np.broadcast_to(np.arange(d76.shape[1]), d76.shape)
+
+    # One ΔE2000 call over the union of candidate columns (at most K*T)
+    cols, inv = np.unique(cand, return_inverse=True)
+    C2 = None if tw_C is None else tw_C[cols]
+    if tw_soa is None:
+        sub = deltaE2000(rgbs_lab, tw_lab[cols], C2=C2)  # (K,U)
+    else:
+        tw_L, tw_a, tw_b = (x[cols] for x in tw_soa)
+        sub = deltaE2000_soa(rgbs_lab[:, 0], rgbs_lab[:, 1], rgbs_lab[:, 2], tw_L, tw_a, tw_b, C2=C2)
+    dists = np.take_along_axis(sub, inv.reshape(cand.shape), axis=1)  # (K,T)
+
+    best = dists.argmin(axis=1)
+    matches = []
+    for row, j in enumerate(best.tolist()):
+        entry = tw_entries[int(cand[row, j])]
+        matches.append(TWMatch(name=entry.name, shade=entry.shade, hex=entry.hex, deltaE=float(dists[row, j])))
+    return matches
+
 # --- Accessibility helpers ---
-def _srgb_to_lin(c: float) -> float:
-    c = c / 255.0
-    return c / 12.92 if c <= 0.04045 * 255 else ((c + 0.055 * 255) / (1.055 * 255)) ** 2.4
+# sRGB byte -> linear light, for all 256 possible channel values
+_c = np.arange(256) / 255.0
+_SRGB_LIN_LUT = np.where(_c <= 0.04045, _c / 12.92, ((_c + 0.055) / 1.055) ** 2.4)
+del _c
+
+_LUM_WEIGHTS = np.array([0.2126, 0.7152, 0.0722])
 
 def relative_luminance(rgb: Tuple[int, int, int]) -> float:
     r, g, b = rgb
-    R = _srgb_to_lin(r)
-    G = _srgb_to_lin(g)
-    B = _srgb_to_lin(b)
-    return 0.2126 * R + 0.7152 * G + 0.0722 * B
+    return float(0.2126 * _SRGB_LIN_LUT[r] + 0.7152 * _SRGB_LIN_LUT[g] + 0.0722 * _SRGB_LIN_LUT[b])
 
 def contrast_ratio(rgb1: Tuple[int,int,int], rgb2: Tuple[int,int,int]) -> float:
     L1 = relative_luminance(rgb1)
@@ -159,6 +396,26 @@ def contrast_ratio(rgb1: Tuple[int,int,int], rgb2: Tuple[int,int,int]) -> float:
     L1, L2 = (L1, L2) if L1 >= L2 else (L2, L1)
     return (L1 + 0.05) / (L2 + 0.05)
 
+def luminance_array(rgb_arr: np.ndarray) -> np.ndarray:
+    """
+    WCAG relative luminance for a uint8 RGB array (K,3) -> float (K,).
+    """
+    lin = _SRGB_LIN_LUT[np.asarray(rgb_arr, dtype=np.uint8)]  # (K,3)
+    return lin @ _LUM_WEIGHTS
+
+def contrast_bw_array(rgb_arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Contrast ratios of (K,3) background colors against black and white text.
+    Returns (cr_black, cr_white), each float (K,).
+    """
+    L = luminance_array(rgb_arr)
+    return (L + 0.05) / 0.05, 1.05 / (L + 0.05)
+
+def wcag_label_array(ratios: np.ndarray) -> np.ndarray:
+    """WCAG level ("AAA", "AA", "AA (Large)", "N/A") for each contrast ratio."""
+    r = np.asarray(ratios)
+    return np.select([r >= 7.0, r >= 4.5, r >= 3.0], ["AAA", "AA", "AA (Large)"], default="N/A")
+
 def ideal_text_color(bg: Tuple[int,int,int]) -> Tuple[int,int,int]:
     """Return black or white depending on which has higher contrast on bg."""
     black = (0,0,0)
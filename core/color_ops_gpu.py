@@ -0,0 +1,126 @@
+# core/color_ops_gpu.py
+from __future__ import annotations
+from typing import List, Optional
+import math
+import numpy as np
+
+from .color_ops import TWMatch, rgb_to_lab
+
+# torch is imported on first use: it is optional and slow/heavy to load,
+# so CPU-only deployments never pay for it
+_torch = None
+_HAS_TORCH: Optional[bool] = None
+
+def _import_torch():
+    """Import torch once and cache it; None if not installed."""
+    global _torch, _HAS_TORCH
+    if _HAS_TORCH is None:
+        try:
+            import torch
+            _torch, _HAS_TORCH = torch, True
+        except ImportError:  # optional: callers fall back to the NumPy path
+            _HAS_TORCH = False
+    return _torch
+
+def gpu_available() -> bool:
+    """True if torch is installed and a CUDA device is usable."""
+    torch = _import_torch()
+    return torch is not None and torch.cuda.is_available()
+
+def to_device(arr: np.ndarray) -> "torch.Tensor":
+    """Copy a NumPy array to the CUDA device as float32."""
+    torch = _import_torch()
+    return torch.from_numpy(np.ascontiguousarray(arr, dtype=np.float32)).cuda()
+
+# ----- ΔE 2000 (CIEDE2000) on torch tensors -----
+def deltaE2000_torch(
+    lab1: "torch.Tensor",
+    lab2: "torch.Tensor",
+    C2: Optional["torch.Tensor"] = None
+) -> "torch.Tensor":
+    """
+    Same formula as color_ops.deltaE2000, on torch tensors (any device).
+    lab1: (N,3) float32  [L*, a*, b*]
+    lab2: (M,3) float32
+    C2:   optional precomputed chroma sqrt(a2^2 + b2^2) of lab2, shape (M,)
+    Returns: (N,M) distances
+    """
+    torch = _import_torch()
+    pi = math.pi
+    p25_7 = 25.0**7
+    L1, a1, b1 = lab1[:, 0:1], lab1[:, 1:2], lab1[:, 2:3]   # (N,1)
+    L2, a2, b2 = lab2[None, :, 0], lab2[None, :, 1], lab2[None, :, 2]  # (1,M)
+
+    # Mean C*
+    C1 = torch.sqrt(a1**2 + b1**2)
+    C2 = torch.sqrt(a2**2 + b2**2) if C2 is None else C2[None, :]
+    C_bar7 = ((C1 + C2) / 2.0)**7
+
+    # G factor, a' and C'
+    G = 0.5 * (1 - torch.sqrt(C_bar7 / (C_bar7 + p25_7)))
+    a1p = (1 + G) * a1
+    a2p = (1 + G) * a2
+    C1p = torch.sqrt(a1p**2 + b1**2)
+    C2p = torch.sqrt(a2p**2 + b2**2)
+
+    # h' in [0, 2pi)
+    h1p = torch.remainder(torch.atan2(b1.expand_as(a1p), a1p), 2*pi)
+    h2p = torch.remainder(torch.atan2(b2.expand_as(a2p), a2p), 2*pi)
+
+    # ΔL', ΔC', ΔH'
+    dLp = L1 - L2
+    dCp = C1p - C2p
+    dhp = torch.remainder(h2p - h1p + pi, 2*pi) - pi
+    dHp = 2.0 * torch.sqrt(C1p * C2p) * torch.sin(dhp / 2.0)
+
+    # L', C', h' means
+    Lp_bar = (L1 + L2) / 2.0
+    Cp_bar = (C1p + C2p) / 2.0
+    hp_sum = h1p + h2p
+    hp_bar = torch.remainder(
+        torch.where(torch.abs(h1p - h2p) > pi, (hp_sum + 2*pi) / 2.0, hp_sum / 2.0), 2*pi)
+
+    T = (1
+         - 0.17*torch.cos(hp_bar - math.radians(30))
+         + 0.24*torch.cos(2*hp_bar)
+         + 0.32*torch.cos(3*hp_bar + math.radians(6))
+         - 0.20*torch.cos(4*hp_bar - math.radians(63)))
+
+    SL = 1 + (0.015 * (Lp_bar - 50)**2) / torch.sqrt(20 + (Lp_bar - 50)**2)
+    SC = 1 + 0.045 * Cp_bar
+    SH = 1 + 0.015 * Cp_bar * T
+
+    delta_theta = math.radians(30) * torch.exp(-((torch.rad2deg(hp_bar) - 275) / 25)**2)
+    Cp_bar7 = Cp_bar**7
+    RC = 2 * torch.sqrt(Cp_bar7 / (Cp_bar7 + p25_7))
+    RT = -torch.sin(2 * delta_theta) * RC
+
+    # kL=kC=kH=1
+    tL = dLp / SL
+    tC = dCp / SC
+    tH = dHp / SH
+    return torch.sqrt(tL**2 + tC**2 + tH**2 + RT * tC * tH)
+
+def nearest_tailwind_torch(
+    rgbs: np.ndarray,
+    tw_entries: List,
+    tw_lab: "torch.Tensor",
+    tw_C: Optional["torch.Tensor"] = None
+) -> List[TWMatch]:
+    """
+    ΔE2000 nearest Tailwind color for each row of a uint8 RGB array (K,3),
+    with tw_lab (and tw_C) already resident on the device.
+    Exhaustive like color_ops.nearest_tailwind_batch, so CPU and GPU pick
+    the same tokens.
+    """
+    torch = _import_torch()
+    rgbs_lab = rgb_to_lab(np.asarray(rgbs, dtype=np.uint8).reshape(-1, 3))  # (K,3)
+    lab = torch.from_numpy(rgbs_lab).to(tw_lab.device)
+    dists = deltaE2000_torch(lab, tw_lab, tw_C)  # (K,M)
+
+    best, ks = dists.min(dim=1)
+    matches = []
+    for k, d in zip(ks.tolist(), best.tolist()):
+        entry = tw_entries[k]
+        matches.append(TWMatch(name=entry.name, shade=entry.shade, hex=entry.hex, deltaE=float(d)))
+    return matches
@@ -1,10 +1,33 @@
 from typing import Tuple
+import io
 import numpy as np
 from PIL import Image
 import cv2
+import streamlit as st
 
+try:
+    import faiss
+    _HAS_FAISS = True
+except ImportError:  # optional: fall back to the NumPy GEMM assignment
+    _HAS_FAISS = False
+
+def _nearest_center(points: np.ndarray, centers: np.ndarray) -> np.ndarray:
+    """
+    Index of the nearest center for each row of points (U,3) float32.
+    |p-c|^2 = |p|^2 - 2p.c + |c|^2 and |p|^2 is constant per point, so the
+    argmin only needs -2p.c + |c|^2: one (U,3)x(3,K) GEMM, no (U,K,3) tensor.
+    """
+    if _HAS_FAISS:
+        index = faiss.IndexFlatL2(3)  # same expansion, in FAISS's BLAS kernel
+        index.add(centers)
+        return index.search(points, 1)[1][:, 0]
+    c2 = (centers ** 2).sum(axis=1)                  # (K,)
+    d2 = points @ (-2.0 * centers.T) + c2[None, :]   # (U,K)
+    return d2.argmin(axis=1)
+
+@st.cache_data(max_entries=4)
 def kmeans_colors(
-    image: Image.Image,
+    image_bytes: bytes,
     k: int = 6,
     sample: int = 400_000,
     seed: int = 42,
@@ -12,10 +35,15 @@ def kmeans_colors(
 ) -> Tuple[np.ndarray, np.ndarray]:
     """
     Return (centers:uint8[K,3], weights:float[K]) for dominant colors using k-means.
-    - Downscales large images for speed.
-    - Uses full (downscaled) frame to estimate cluster weights.
+    - Takes the encoded image bytes so Streamlit can cache results across reruns.
+    - Downscales large images for speed (JPEGs already while decoding).
+    - Clusters with cv2.kmeans (k-means++, 3 attempts) on a pixel sample.
+    - Uses full (downscaled) frame to estimate cluster weights, labelling
+      each distinct RGB value once and weighting it by its pixel count.
     """
-    img = image.convert("RGB")
+    img = Image.open(io.BytesIO(image_bytes))
+    img.draft("RGB", (max_side, max_side))
+    img = img.convert("RGB")
     arr = np.array(img)
     h, w, _ = arr.shape
 
@@ -24,28 +52,30 @@ def kmeans_colors(
         scale = max_side / max(h, w)
         arr = cv2.resize(arr, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
 
-    pixels = arr.reshape(-1, 3).astype(np.float32)
+    flat = arr.reshape(-1, 3)
 
     # Subsample for k-means speed if needed
-    if pixels.shape[0] > sample:
+    if flat.shape[0] > sample:
         rng = np.random.default_rng(seed)
-        idx = rng.choice(pixels.shape[0], size=sample, replace=False)
-        data = pixels[idx]
+        idx = rng.choice(flat.shape[0], size=sample, replace=False)
+        data = flat[idx].astype(np.float32)
     else:
-        data = pixels
+        data = flat.astype(np.float32)
+
+    # Collapse the frame to its distinct colors (U << N for real photos)
+    packed = (flat[:, 0].astype(np.uint32) << 16) | (flat[:, 1].astype(np.uint32) << 8) | flat[:, 2]
+    uniq, counts = np.unique(packed, return_counts=True)
+    colors = np.stack([uniq >> 16, (uniq >> 8) & 0xFF, uniq & 0xFF], axis=1).astype(np.float32)  # (U,3)
 
-    # OpenCV kmeans
+    # OpenCV kmeans (k-means++ init, 3 attempts)
     criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 40, 0.2)
     _, _, centers = cv2.kmeans(data, k, None, criteria, 3, cv2.KMEANS_PP_CENTERS)
     centers = centers.clip(0, 255).astype(np.uint8)
 
-    # Estimate weights by assigning all pixels (downscaled) to nearest center
-    centers_f = centers.astype(np.float32)
-    diffs = arr.reshape(-1, 1, 3).astype(np.float32) - centers_f[None, :, :]
-    d2 = (diffs ** 2).sum(axis=2)  # (N,K)
-    labels = d2.argmin(axis=1)     # (N,)
-    counts = np.bincount(labels, minlength=k)
-    weights = counts / counts.sum()
+    # Estimate weights by assigning every distinct color to nearest center
+    labels = _nearest_center(colors, centers.astype(np.float32))  # (U,)
+    totals = np.bincount(labels, weights=counts, minlength=k)
+    weights = totals / totals.sum()
 
     # Sort by prevalence
     order = (-weights).argsort()
@@ -4,9 +4,8 @@ from dataclasses import dataclass
 from typing import Dict, List, Tuple
 import re
 import requests
-import json5
 import numpy as np
-from .color_ops import hex_to_rgb, rgb_to_lab
+from .color_ops import hex_array_to_rgb, rgb_to_lab
 
 # ---- Fallback: your compact, local subset (used if network fails) ----
 FALLBACK_TAILWIND: Dict[str, Dict[int, str]] = {
@@ -43,16 +42,34 @@ CDN_CANDIDATES = [
     "https://raw.githubusercontent.com/tailwindlabs/tailwindcss/master/src/public/colors.js",
 ]
 
+# `name: { 50: '#f8fafc', ... }` groups, and `shade: 'hex'` pairs inside them
+_COLOR_GROUP_RE = re.compile(r"(\w+):\s*\{([^}]+)\}")
+_SHADE_RE = re.compile(r"(\d+):\s*['\"](#[0-9a-fA-F]{6})\b")
+
 def _extract_js_object(js_text: str) -> str:
     """
     Extract the JS object from either `module.exports = {...}` or `export default {...}`.
     Returns the object literal as a string.
     """
-    m = re.search(r"(module\\.exports\\s*=|export\\s+default)\\s*(\\{[\\s\\S]*\\})", js_text)
+    m = re.search(r"(module\.exports\s*=|export\s+default)\s*(\{[\s\S]*\})", js_text)
     if not m:
         raise ValueError("Could not locate object literal in colors.js")
     return m.group(2)
 
+def _parse_palette(obj_text: str) -> Dict[str, Dict[int, str]]:
+    """
+    Pull `{ colorName: { shade -> hex } }` out of the colors.js object literal.
+    Entries without numeric hex shades (black, white, getters, ...) are skipped.
+    """
+    palette: Dict[str, Dict[int, str]] = {}
+    for m in _COLOR_GROUP_RE.finditer(obj_text):
+        shades = {int(s): hx for s, hx in _SHADE_RE.findall(m.group(2))}
+        if shades:
+            palette[m.group(1)] = shades
+    if not palette:
+        raise ValueError("No color shades found in colors.js")
+    return palette
+
 def fetch_tailwind_full_palette(timeout: float = 6.0) -> Dict[str, Dict[int, str]]:
     """
     Try several CDNs to fetch Tailwind's color palette.
@@ -65,12 +82,7 @@ def fetch_tailwind_full_palette(timeout: float = 6.0) -> Dict[str, Dict[int, str
             r = requests.get(url, timeout=timeout)
             r.raise_for_status()
             obj_text = _extract_js_object(r.text)
-            raw = json5.loads(obj_text)  # tolerant parser (unquoted numeric keys, comments, etc.)
-            # Keep only nested dicts with hex shades
-            palette = {k: v for k, v in raw.items() if isinstance(v, dict)}
-            # Ensure all shades are hex strings
-            for name, shades in list(palette.items()):
-                palette[name] = {int(s): str(hx) for s, hx in shades.items()}
+            palette = _parse_palette(obj_text)
             # optional: remove deprecated aliases if any (e.g., 'lightBlue' -> 'sky')
             palette.pop("lightBlue", None)
             palette.pop("warmGray", None)
@@ -91,17 +103,24 @@ class TWEntry:
     shade: int
     hex: str
 
-def build_tailwind_entries_and_lab_remote() -> Tuple[List[TWEntry], np.ndarray]:
+def build_tailwind_entries_and_lab_remote() -> Tuple[
+    List[TWEntry], np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray
+]:
     """
     Fetch Tailwind colors remotely (with fallback) and precompute LAB array.
+    Also returns the LAB chroma sqrt(a^2 + b^2) per entry, which is fixed
+    and can be reused by every deltaE2000 query, and the L/a/b channels as
+    separate contiguous float32 arrays for deltaE2000_soa.
+    Returns: (entries, lab (M,3), chroma (M,), L (M,), a (M,), b (M,))
     """
     palette = fetch_tailwind_full_palette()
-    entries: List[TWEntry] = []
-    rgbs: List[Tuple[int, int, int]] = []
-    for name, shades in palette.items():
-        for shade, hx in shades.items():
-            entries.append(TWEntry(name=name, shade=shade, hex=hx))
-            rgbs.append(hex_to_rgb(hx))
-    rgb_arr = np.array(rgbs, dtype=np.uint8)
+    entries: List[TWEntry] = [
+        TWEntry(name=name, shade=shade, hex=hx)
+        for name, shades in palette.items()
+        for shade, hx in shades.items()
+    ]
+    rgb_arr = hex_array_to_rgb([e.hex for e in entries])
     lab_arr = rgb_to_lab(rgb_arr)
-    return entries, lab_arr
+    chroma = np.sqrt(lab_arr[:, 1]**2 + lab_arr[:, 2]**2)
+    tw_L, tw_a, tw_b = (np.ascontiguousarray(lab_arr[:, i]) for i in range(3))
+    return entries, lab_arr, chroma, tw_L, tw_a, tw_b
@@ -1,7 +1,7 @@
-import io
 import json
 import colorsys
 
+import numpy as np
 import streamlit as st
 from PIL import Image
 
@@ -9,10 +9,11 @@ from core.tailwind import build_tailwind_entries_and_lab_remote
 from core.color_ops import (
     rgb_to_hex,
     TWMatch,
-    nearest_tailwind,
-    ideal_text_color,
-    contrast_ratio,
+    nearest_tailwind_batch,
+    contrast_bw_array,
+    wcag_label_array,
 )
+from core.color_ops_gpu import gpu_available, to_device, nearest_tailwind_torch
 from core.extractor import kmeans_colors
 from core.ui import render_palette_grid
 
@@ -22,7 +23,25 @@ st.set_page_config(page_title="Real-time Palette Extractor", page_icon="🎨", l
 def _load_tailwind_cache():
     return build_tailwind_entries_and_lab_remote()
 
-TW_ENTRIES, TW_LAB = _load_tailwind_cache()
+TW_ENTRIES, TW_LAB, TW_C, TW_L, TW_A, TW_B = _load_tailwind_cache()
+
+@st.cache_resource
+def _load_tailwind_gpu():
+    # Tailwind LAB/chroma stay resident on the GPU across reruns
+    if not gpu_available():
+        return None, None
+    return to_device(TW_LAB), to_device(TW_C)
+
+TW_LAB_GPU, TW_C_GPU = _load_tailwind_gpu()
+
+@st.cache_data(max_entries=32)
+def _match_tailwind(center_rgbs: tuple, use_de2000: bool):
+    centers = np.array(center_rgbs, dtype=np.uint8)
+    if use_de2000 and TW_LAB_GPU is not None:
+        return nearest_tailwind_torch(centers, TW_ENTRIES, TW_LAB_GPU, tw_C=TW_C_GPU)
+    if use_de2000:
+        return nearest_tailwind_batch(centers, TW_ENTRIES, TW_LAB, method="DE2000", tw_C=TW_C, tw_soa=(TW_L, TW_A, TW_B))
+    return nearest_tailwind_batch(centers, TW_ENTRIES, TW_LAB, method="DE76")
 
 st.markdown("""
 # 🎨 Real-time Image Color Palette Extractor
@@ -54,7 +73,8 @@ col_img, col_pal = st.columns([1, 1.2])
 with col_img:
     file = st.file_uploader("Upload an image", type=["png", "jpg", "jpeg", "webp"])
     if file:
-        image = Image.open(io.BytesIO(file.read()))
+        image = Image.open(file)          # UploadedFile is already file-like
+        image.draft("RGB", (1024, 1024))  # JPEG: let libjpeg downscale while decoding
         st.image(image, use_column_width=True, caption="Uploaded image")
     else:
         st.info("Upload an image to get started.")
@@ -63,7 +83,7 @@ with col_pal:
     if not file:
         st.empty()
     else:
-        centers, weights = kmeans_colors(image, k=k)
+        centers, weights = kmeans_colors(file.getvalue(), k=k)
 
         items = []
         css_vars = []
@@ -78,31 +98,30 @@ with col_pal:
             r, g, b = rgb
             return 0.2126 * (r/255.0) + 0.7152 * (g/255.0) + 0.0722 * (b/255.0)
 
-        method = "DE2000" if use_de2000 else "DE76"
         delta_label = "ΔE2000" if use_de2000 else "ΔE76"
 
+        tw_matches = None
+        if show_tailwind:
+            tw_matches = _match_tailwind(tuple(map(tuple, centers.tolist())), use_de2000)
+
+        # Contrast of every centroid against black / white text in one pass
+        cr_black, cr_white = contrast_bw_array(centers)
+        ideal = np.where(cr_white >= cr_black, 255, 0)
+        wcag = wcag_label_array(np.maximum(cr_black, cr_white))
+
         raw_items = []
         for idx, (c, w) in enumerate(zip(centers, weights), start=1):
             rgb = tuple(int(x) for x in c.tolist())
             hexv = rgb_to_hex(rgb)
 
             tw = None
-            if show_tailwind:
-                twm = nearest_tailwind(rgb, TW_ENTRIES, TW_LAB, method=method)
+            if tw_matches:
+                twm = tw_matches[idx - 1]
                 tw = {"token": f"{twm.name}-{twm.shade}", "hex": twm.hex, "deltaE": twm.deltaE, "delta_label": delta_label}
 
-            itc = ideal_text_color(rgb)
-            cr_b = contrast_ratio(rgb, (0, 0, 0))
-            cr_w = contrast_ratio(rgb, (255, 255, 255))
-            best_cr = max(cr_b, cr_w)
-            if best_cr >= 7:
-                wcag = "AAA"
-            elif best_cr >= 4.5:
-                wcag = "AA"
-            elif best_cr >= 3:
-                wcag = "AA (Large)"
-            else:
-                wcag = "N/A"
+            itc = (int(ideal[idx - 1]),) * 3
+            cr_b = float(cr_black[idx - 1])
+            cr_w = float(cr_white[idx - 1])
 
             raw_items.append({
                 "index": idx,
@@ -113,7 +132,7 @@ with col_pal:
                 "ideal_text": f"rgb({itc[0]},{itc[1]},{itc[2]})",
                 "cr_black": cr_b,
                 "cr_white": cr_w,
-                "wcag_label": wcag,
+                "wcag_label": str(wcag[idx - 1]),
                 "_hue": rgb_to_hsv_deg(rgb)[0],
                 "_lum": luminance(rgb),
             })